@@ -2,24 +2,257 @@
 CrewAI Multi-Agent System for AutoXloo
 Coordinates specialized AI agents for automotive sales
 """
-from crewai import Agent, Task, Crew, Process
-from langchain_openai import ChatOpenAI
+from __future__ import annotations
 from typing import List, Dict, Optional
+from collections import deque
+import asyncio
+import hashlib
+import secrets
+import re
+import string
+import time
 import uuid
 import os
-import json
-from pinecone import Pinecone
-from sentence_transformers import SentenceTransformer
+import orjson
+import httpx
+import numpy as np
 from agents.tools import AGENT_TOOLS
 
+# Heavy frameworks (crewai, langchain, pinecone, sentence_transformers) are
+# imported lazily at their use sites so importing this module stays cheap
+# and the FastAPI worker can bind its port quickly.
+
+try:
+    from numba import njit
+except ImportError:  # Numba is an optional accelerator
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+
+# Static prompt shells, built once at import. Only the variable slots are
+# interpolated per request instead of rebuilding multi-KB strings each turn.
+_SEARCH_TASK_TEMPLATE = string.Template("""
+            Customer message: "$message"
+
+            Search criteria: $criteria
+
+            Matching vehicles:
+            $vehicles
+            $kb_context
+
+            RESPONSE FORMAT REQUIREMENTS:
+            - Start with 1-sentence recommendation
+            - Use Markdown table for comparison (Max 3 vehicles)
+            - Table columns: Vehicle | Price | Key Features | Rating
+            - Add 2-3 bullet points for top pick only
+            - Total response: MAX 150 words
+            - NO long paragraphs
+
+            Example format:
+            "I recommend the [Vehicle]. Here's the comparison:
+
+            | Vehicle | Price | Safety | MPG |
+            |---------|-------|--------|-----|
+            | Honda CR-V | $$41k | 5★ Honda Sensing | 30 |
+
+            **Top Pick**: Honda CR-V
+            - Full safety suite included
+            - Brand new with warranty
+            - Ready for test drive
+
+            Questions?"
+            """)
+
+_SCHEDULING_TASK_TEMPLATE = string.Template("""
+            Customer message: "$message"
+
+            The customer wants to schedule a test drive or appointment.
+            Generate a confirmation with:
+            - Appointment date/time
+            - Confirmation number (format: TD-XXXXX)
+            - Dealership location
+            - What to bring
+            - Contact info
+
+            Mock appointment booking (for demo purposes):
+            - Available slots: Monday-Saturday, 9 AM - 6 PM
+            - Location: AutoXloo Premium Dealership, 123 Main St
+            - Confirmation #: TD-$confirmation
+            """)
+
+_QUALIFICATION_TASK_TEMPLATE = string.Template("""
+            Customer message: "$message"
+            Conversation context: $context
+
+            As a sales development rep, your job is to:
+            1. Acknowledge their interest
+            2. Ask 1-2 qualifying questions about:
+               - Timeline for purchase
+               - Trade-in vehicle (if any)
+               - Financing needs
+               - Primary use case (family, commute, etc.)
+
+            Be conversational and helpful, not pushy.
+            """)
+
+
+# Keyword table for _extract_search_criteria: maps recognized tokens to the
+# criteria field/value they set, so one compiled regex pass replaces a chain
+# of substring scans over the message
+_KEYWORD_MAP = {
+    # Price caps (only applied when the message says "under"/"below")
+    '25k': ('max_price', 25000),
+    '25000': ('max_price', 25000),
+    '30k': ('max_price', 30000),
+    '30000': ('max_price', 30000),
+    '30,000': ('max_price', 30000),
+    '35k': ('max_price', 35000),
+    '35000': ('max_price', 35000),
+    # Categories
+    'suv': ('category', 'suv'),
+    'truck': ('category', 'truck'),
+    'sedan': ('category', 'sedan'),
+    'electric': ('category', 'electric'),
+    'ev': ('category', 'electric'),
+    # Makes
+    'honda': ('make', 'Honda'),
+    'toyota': ('make', 'Toyota'),
+    'ford': ('make', 'Ford'),
+    'chevrolet': ('make', 'Chevrolet'),
+    'nissan': ('make', 'Nissan'),
+    'subaru': ('make', 'Subaru'),
+    'mazda': ('make', 'Mazda'),
+    # Features
+    'safety': ('feature', 'Blind Spot Monitoring'),
+    'safe': ('feature', 'Blind Spot Monitoring'),
+    'navigation': ('feature', 'Navigation System'),
+    'nav': ('feature', 'Navigation System'),
+    'leather': ('feature', 'Leather Seats'),
+}
+
+# Longest tokens first so e.g. '30,000' wins over '30k'-style overlaps.
+# The optional trailing 's' keeps plurals ("SUVs", "trucks") matching the
+# same map entry; group(1) still captures the singular key.
+_KEYWORD_RE = re.compile(
+    r'\b(%s)s?\b' % '|'.join(re.escape(k) for k in sorted(_KEYWORD_MAP, key=len, reverse=True))
+)
+
+
+@njit(cache=True)
+def _filter_inventory(prices, years, cat_ids, make_ids, available,
+                      max_price, min_price, want_cat, want_make, want_year):
+    """Return indices of inventory rows matching the given filters
+
+    Purely numeric so Numba can compile it to machine code; a filter value
+    of -1 means "not constrained". Falls back to plain NumPy when Numba
+    isn't installed.
+    """
+    mask = available.copy()
+    if max_price >= 0:
+        mask &= prices <= max_price
+    if min_price >= 0:
+        mask &= prices >= min_price
+    if want_cat != -1:
+        mask &= cat_ids == want_cat
+    if want_make != -1:
+        mask &= make_ids == want_make
+    if want_year >= 0:
+        mask &= years == want_year
+    return np.flatnonzero(mask)
+
+
+class EmbeddingBatcher:
+    """Micro-batcher for SentenceTransformer encode calls
+
+    Collects queries submitted within a short window and encodes them as a
+    single batch, so concurrent chat requests share one forward pass through
+    the model instead of paying for one each.
+    """
+
+    def __init__(self, model, window: float = 0.01, max_batch: int = 32):
+        self.model = model
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker = None
+
+    async def submit(self, query: str) -> List[float]:
+        """Submit a query for encoding, returns the embedding vector"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((query, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.window)  # Collect concurrent submissions
+            while not self._queue.empty() and len(batch) < self.max_batch:
+                batch.append(self._queue.get_nowait())
+
+            texts = [query for query, _ in batch]
+            try:
+                vectors = await loop.run_in_executor(None, lambda: self.model.encode(
+                    texts,
+                    batch_size=len(texts),
+                    normalize_embeddings=True,
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                ))
+                for (_, future), vector in zip(batch, vectors):
+                    if not future.done():
+                        future.set_result(vector.tolist())
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
 
 class AutoXlooCrew:
     """Multi-agent system for handling customer interactions"""
-    
+
+    # How long a cached LLM response stays valid
+    RESPONSE_CACHE_TTL = 600  # seconds
+
     def __init__(self, inventory_data: List[Dict]):
         self.inventory = inventory_data
-        
+
+        # Structure-of-arrays view of the inventory for fast filtering.
+        # Built once so _search_inventory can combine all filters into a
+        # single boolean mask instead of re-scanning dicts per criterion.
+        self._inv_prices = np.array([v['price'] for v in inventory_data], dtype=np.int32)
+        self._inv_years = np.array([v['year'] for v in inventory_data], dtype=np.int16)
+        self._inv_available = np.array([v.get('available', True) for v in inventory_data], dtype=bool)
+
+        # Categories/makes are encoded to int16 ids so the filter kernel
+        # stays purely numeric (and Numba-compilable)
+        self._cat_code = {}
+        self._make_code = {}
+        self._inv_cat_ids = np.array(
+            [self._cat_code.setdefault(v['category'].lower(), len(self._cat_code))
+             for v in inventory_data], dtype=np.int16)
+        self._inv_make_ids = np.array(
+            [self._make_code.setdefault(v['make'].lower(), len(self._make_code))
+             for v in inventory_data], dtype=np.int16)
+
+        # Price-sorted view so price-bounded searches can binary-search the
+        # [min_price, max_price] window instead of scanning every row
+        self._price_order = np.argsort(self._inv_prices, kind='stable')
+        self._prices_sorted = self._inv_prices[self._price_order]
+
+        # Warm the filter kernel so JIT compilation happens at startup,
+        # not on the first customer query
+        _filter_inventory(self._inv_prices, self._inv_years, self._inv_cat_ids,
+                          self._inv_make_ids, self._inv_available, -1, -1, -1, -1, -1)
+
         # Configure LLM (supports both OpenAI and DeepSeek)
+        from langchain_openai import ChatOpenAI
+
         api_key = os.getenv("DEEPSEEK_API_KEY") or os.getenv("OPENAI_API_KEY")
         model = os.getenv("LLM_MODEL", "deepseek-chat")
         base_url = os.getenv("LLM_BASE_URL", "https://api.deepseek.com")
@@ -29,13 +262,29 @@ class AutoXlooCrew:
             # Fallback to prevent crash during init, will fail if used
             api_key = "missing-key"
         
-        self.llm = ChatOpenAI(
+        llm_kwargs = dict(
             model=model,
             temperature=0.7,
             openai_api_key=api_key,
-            base_url=base_url
+            base_url=base_url,
         )
+        # Shared async HTTP client so LLM calls don't block the event loop
+        # and connections are pooled across the app lifecycle. Only pass it
+        # when the installed langchain-openai accepts the parameter (added
+        # in 0.1.3) - older versions shunt unknown kwargs into model_kwargs
+        # and forward them to the completions API, breaking every call.
+        llm_fields = (getattr(ChatOpenAI, 'model_fields', None)
+                      or getattr(ChatOpenAI, '__fields__', {}))
+        if 'http_async_client' in llm_fields:
+            self._http_async_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100)
+            )
+            llm_kwargs['http_async_client'] = self._http_async_client
+        else:
+            self._http_async_client = None
+        self.llm = ChatOpenAI(**llm_kwargs)
         self.conversations = {}  # Store conversation history
+        self._resp_cache = {}  # (route, msg-hash, criteria, stock#s) -> (timestamp, response)
         
         # Load knowledge base
         self.knowledge_base = self._load_knowledge_base()
@@ -43,13 +292,27 @@ class AutoXlooCrew:
         # Initialize Pinecone
         self.pinecone_api_key = os.getenv("PINECONE_API_KEY")
         self.pinecone_index_name = os.getenv("PINECONE_INDEX_NAME", "autoxloo-vehicles")
+        # Set PINECONE_VECTOR_TYPE=int8 when the index is created with
+        # int8 vectors: queries then ship 1 byte per dimension instead of 4
+        self.pinecone_int8 = os.getenv("PINECONE_VECTOR_TYPE", "").lower() == "int8"
         self.pc = None
         self.embedding_model = None
-        
+        self._embed_cache = {}  # Query embedding cache (content-hash -> vector)
+        self._embed_batcher = None
+        self._pinecone_index = None
+        # Bound concurrent Pinecone queries so bursts don't hit rate limits
+        self._pinecone_sem = asyncio.Semaphore(8)
+
         if self.pinecone_api_key:
             try:
+                from pinecone import Pinecone
+
                 self.pc = Pinecone(api_key=self.pinecone_api_key)
-                self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+                # Resolve the index handle once; re-creating it per query
+                # repeats SDK/host setup
+                self._pinecone_index = self.pc.Index(self.pinecone_index_name)
+                self.embedding_model = self._load_embedding_model()
+                self._embed_batcher = EmbeddingBatcher(self.embedding_model)
                 print("✓ Pinecone and embedding model initialized")
             except Exception as e:
                 print(f"⚠ Warning: Failed to initialize Pinecone: {e}")
@@ -61,41 +324,84 @@ class AutoXlooCrew:
         self.research_agent = self._create_research_agent()
         self.scheduling_agent = self._create_scheduling_agent()
         self.qualifier_agent = self._create_qualifier_agent()
-    
+
+    @staticmethod
+    def _load_embedding_model() -> SentenceTransformer:
+        """Load MiniLM, preferring the int8 ONNX backend when available"""
+        from sentence_transformers import SentenceTransformer
+
+        try:
+            model = SentenceTransformer(
+                'all-MiniLM-L6-v2',
+                backend='onnx',
+                model_kwargs={'file_name': 'onnx/model_qint8_avx512_vnni.onnx'}
+            )
+            print("✓ Using quantized ONNX embedding backend")
+        except Exception:
+            # Older sentence-transformers or missing onnxruntime - fall
+            # back to the default PyTorch fp32 backend
+            model = SentenceTransformer('all-MiniLM-L6-v2')
+
+        # Warm up so the first customer query doesn't pay lazy-init /
+        # graph-compilation costs
+        model.encode('warmup', show_progress_bar=False)
+        return model
+
     def _load_knowledge_base(self) -> List[Dict]:
         """Load vehicle knowledge base from JSON file"""
         try:
-            with open('../data/vehicle_knowledge_base.json', 'r') as f:
-                kb = json.load(f)
+            with open('../data/vehicle_knowledge_base.json', 'rb') as f:
+                kb = orjson.loads(f.read())
             print(f"✓ Loaded knowledge base with {len(kb)} vehicle specs")
-            return kb
         except FileNotFoundError:
             print("⚠ Warning: Knowledge base not found")
-            return []
-    
+            kb = []
+
+        # Index by (make, model) so spec lookups are O(1) instead of
+        # lowercasing and scanning every entry per call
+        self._kb_index = {(e['make'].lower(), e['model'].lower()): e for e in kb}
+        return kb
+
     def _get_vehicle_specs(self, make: str, model: str) -> Optional[Dict]:
         """Get detailed specs for a vehicle from knowledge base"""
-        for entry in self.knowledge_base:
-            if entry['make'].lower() == make.lower() and entry['model'].lower() == model.lower():
-                return entry
-        return None
+        return self._kb_index.get((make.lower(), model.lower()))
+
+    async def _embed(self, query: str) -> List[float]:
+        """Encode a query into a vector, caching results for repeat queries"""
+        key = hashlib.sha1(query.strip().lower().encode()).digest()
+        vector = self._embed_cache.get(key)
+        if vector is None:
+            vector = await self._embed_batcher.submit(query)
+            if len(self._embed_cache) < 4096:  # Bound cache size
+                self._embed_cache[key] = vector
+        return vector
 
-    def _search_knowledge_base(self, query: str, limit: int = 3) -> str:
+    async def _search_knowledge_base(self, query: str, limit: int = 3) -> str:
         """Search knowledge base using Pinecone semantic search"""
         if not self.pc or not self.embedding_model:
             return ""
-            
+
         try:
-            # Generate embedding for query
-            query_vector = self.embedding_model.encode(query).tolist()
+            # Generate embedding for query (batched + cached). Vectors are
+            # unit-normalized at encode time, so cosine scores are unchanged
+            query_vector = await self._embed(query)
+            if self.pinecone_int8:
+                # Unit-norm components fit int8 after scaling by 127
+                query_vector = (
+                    (np.asarray(query_vector) * 127)
+                    .clip(-127, 127)
+                    .astype(np.int8)
+                    .tolist()
+                )
             
-            # Search Pinecone
-            index = self.pc.Index(self.pinecone_index_name)
-            results = index.query(
-                vector=query_vector,
-                top_k=limit,
-                include_metadata=True
-            )
+            # Search Pinecone (off the event loop, bounded concurrency)
+            async with self._pinecone_sem:
+                loop = asyncio.get_running_loop()
+                results = await loop.run_in_executor(None, lambda: self._pinecone_index.query(
+                    vector=query_vector,
+                    top_k=limit,
+                    include_metadata=True
+                ))
             
             # Format results
             context = "\n\nRelevant Vehicle Information (Semantic Search):\n"
@@ -114,6 +420,8 @@ class AutoXlooCrew:
     
     def _create_research_agent(self) -> Agent:
         """Vehicle research expert with inventory knowledge"""
+        from crewai import Agent
+
         return Agent(
             role="Vehicle Research Specialist",
             goal="Help customers find vehicles quickly with concise, scannable responses",
@@ -134,6 +442,8 @@ class AutoXlooCrew:
     
     def _create_scheduling_agent(self) -> Agent:
         """Appointment scheduling coordinator"""
+        from crewai import Agent
+
         return Agent(
             role="Appointment Scheduling Coordinator",
             goal="Seamlessly schedule test drives and sales appointments for customers",
@@ -149,6 +459,8 @@ class AutoXlooCrew:
     
     def _create_qualifier_agent(self) -> Agent:
         """Lead qualification specialist"""
+        from crewai import Agent
+
         return Agent(
             role="Sales Development Representative",
             goal="Qualify leads and gather information to help the sales team close deals",
@@ -163,35 +475,44 @@ class AutoXlooCrew:
     
     def _search_inventory(self, criteria: Dict) -> List[Dict]:
         """Search inventory based on customer criteria"""
-        results = self.inventory.copy()
-        
-        # Filter by price
-        if 'max_price' in criteria:
-            results = [v for v in results if v['price'] <= criteria['max_price']]
-        
-        if 'min_price' in criteria:
-            results = [v for v in results if v['price'] >= criteria['min_price']]
-        
-        # Filter by category
-        if 'category' in criteria:
-            results = [v for v in results if v['category'].lower() == criteria['category'].lower()]
-        
-        # Filter by make
-        if 'make' in criteria:
-            results = [v for v in results if v['make'].lower() == criteria['make'].lower()]
-        
-        # Filter by year
-        if 'year' in criteria:
-            results = [v for v in results if v['year'] == criteria['year']]
-        
-        # Filter by features
+        # All numeric/categorical filters run in one compiled pass over the
+        # structure-of-arrays inventory view; -1 means "not constrained"
+        # and -2 is an id no row carries (unknown category/make -> no match)
+        want_cat = self._cat_code.get(criteria['category'].lower(), -2) if 'category' in criteria else -1
+        want_make = self._make_code.get(criteria['make'].lower(), -2) if 'make' in criteria else -1
+        want_year = criteria.get('year', -1)
+
+        if 'max_price' in criteria or 'min_price' in criteria:
+            # Binary-search the price-sorted order for the price window,
+            # then run the remaining filters over just that candidate slice
+            lo = np.searchsorted(self._prices_sorted, criteria.get('min_price', 0), side='left')
+            hi = np.searchsorted(
+                self._prices_sorted,
+                criteria.get('max_price', np.iinfo(np.int32).max),
+                side='right'
+            )
+            candidates = self._price_order[lo:hi]
+            indices = candidates[_filter_inventory(
+                self._inv_prices[candidates], self._inv_years[candidates],
+                self._inv_cat_ids[candidates], self._inv_make_ids[candidates],
+                self._inv_available[candidates],
+                -1, -1, want_cat, want_make, want_year
+            )]
+        else:
+            indices = _filter_inventory(
+                self._inv_prices, self._inv_years, self._inv_cat_ids,
+                self._inv_make_ids, self._inv_available,
+                -1, -1, want_cat, want_make, want_year
+            )
+
+        results = [self.inventory[i] for i in indices]
+
+        # Feature lists stay as Python lists, so filter those on the
+        # (already much smaller) candidate set
         if 'features' in criteria:
             for feature in criteria['features']:
                 results = [v for v in results if feature in v.get('features', [])]
-        
-        # Only show available vehicles
-        results = [v for v in results if v.get('available', True)]
-        
+
         return results[:10]  # Return top 10 matches
     
     def _extract_search_criteria(self, message: str) -> Dict:
@@ -201,45 +522,26 @@ class AutoXlooCrew:
         """
         criteria = {}
         message_lower = message.lower()
-        
-        # Extract price
-        if 'under' in message_lower or 'below' in message_lower:
-            # Simple regex would work here, for now use keywords
-            if '30k' in message_lower or '30000' in message_lower or '30,000' in message_lower:
-                criteria['max_price'] = 30000
-            elif '35k' in message_lower or '35000' in message_lower:
-                criteria['max_price'] = 35000
-            elif '25k' in message_lower or '25000' in message_lower:
-                criteria['max_price'] = 25000
-        
-        # Extract category
-        if 'suv' in message_lower:
-            criteria['category'] = 'suv'
-        elif 'truck' in message_lower:
-            criteria['category'] = 'truck'
-        elif 'sedan' in message_lower:
-            criteria['category'] = 'sedan'
-        elif 'electric' in message_lower or 'ev' in message_lower:
-            criteria['category'] = 'electric'
-        
-        # Extract make
-        makes = ['honda', 'toyota', 'ford', 'chevrolet', 'nissan', 'subaru', 'mazda']
-        for make in makes:
-            if make in message_lower:
-                criteria['make'] = make.title()
-        
-        # Extract features
+
+        # Price caps only apply to "under X" / "below X" phrasing
+        price_capped = 'under' in message_lower or 'below' in message_lower
+
+        # Single compiled scan over the message; first match wins per field
         features = []
-        if 'safety' in message_lower or 'safe' in message_lower:
-            features.append('Blind Spot Monitoring')
-        if 'navigation' in message_lower or 'nav' in message_lower:
-            features.append('Navigation System')
-        if 'leather' in message_lower:
-            features.append('Leather Seats')
-        
+        for match in _KEYWORD_RE.finditer(message_lower):
+            field, value = _KEYWORD_MAP[match.group(1)]
+            if field == 'feature':
+                if value not in features:
+                    features.append(value)
+            elif field == 'max_price':
+                if price_capped:
+                    criteria.setdefault(field, value)
+            else:
+                criteria.setdefault(field, value)
+
         if features:
             criteria['features'] = features
-        
+
         return criteria
     
     def _format_vehicle_recommendation(self, vehicle: Dict) -> str:
@@ -268,11 +570,20 @@ class AutoXlooCrew:
         
         return base_info
     
-    def _create_vehicle_search_task(self, message: str) -> Task:
+    async def _create_vehicle_search_task(
+        self,
+        message: str,
+        criteria: Optional[Dict] = None,
+        matching_vehicles: Optional[List[Dict]] = None
+    ) -> Task:
         """Create task for vehicle research with knowledge base context"""
-        criteria = self._extract_search_criteria(message)
-        matching_vehicles = self._search_inventory(criteria)
-        
+        from crewai import Task
+
+        if criteria is None:
+            criteria = self._extract_search_criteria(message)
+        if matching_vehicles is None:
+            matching_vehicles = self._search_inventory(criteria)
+
         vehicles_text = "\n\n".join([
             self._format_vehicle_recommendation(v) for v in matching_vehicles[:3]
         ])
@@ -290,90 +601,97 @@ class AutoXlooCrew:
                         kb_context += f"\n\n{vehicle['make']} {vehicle['model']} Safety Features: {', '.join(safety_features[:5])}"
 
         # 2. Add semantic search results from Pinecone (for general queries)
-        semantic_results = self._search_knowledge_base(message)
+        semantic_results = await self._search_knowledge_base(message)
         if semantic_results:
             kb_context += f"\n{semantic_results}"
         
         return Task(
-            description=f"""
-            Customer message: "{message}"
-            
-            Search criteria: {criteria}
-            
-            Matching vehicles:
-            {vehicles_text if matching_vehicles else "No exact matches found"}
-            {kb_context}
-            
-            RESPONSE FORMAT REQUIREMENTS:
-            - Start with 1-sentence recommendation
-            - Use Markdown table for comparison (Max 3 vehicles)
-            - Table columns: Vehicle | Price | Key Features | Rating
-            - Add 2-3 bullet points for top pick only
-            - Total response: MAX 150 words
-            - NO long paragraphs
-            
-            Example format:
-            "I recommend the [Vehicle]. Here's the comparison:
-            
-            | Vehicle | Price | Safety | MPG |
-            |---------|-------|--------|-----|
-            | Honda CR-V | $41k | 5★ Honda Sensing | 30 |
-            
-            **Top Pick**: Honda CR-V
-            - Full safety suite included
-            - Brand new with warranty
-            - Ready for test drive
-            
-            Questions?"
-            """,
+            description=_SEARCH_TASK_TEMPLATE.substitute(
+                message=message,
+                criteria=criteria,
+                vehicles=vehicles_text if matching_vehicles else "No exact matches found",
+                kb_context=kb_context
+            ),
             agent=self.research_agent,
             expected_output="Concise response with table and bullets, under 150 words"
         )
     
     def _create_scheduling_task(self, message: str) -> Task:
         """Create task for appointment scheduling"""
+        from crewai import Task
+
         return Task(
-            description=f"""
-            Customer message: "{message}"
-            
-            The customer wants to schedule a test drive or appointment.
-            Generate a confirmation with:
-            - Appointment date/time
-            - Confirmation number (format: TD-XXXXX)
-            - Dealership location
-            - What to bring
-            - Contact info
-            
-            Mock appointment booking (for demo purposes):
-            - Available slots: Monday-Saturday, 9 AM - 6 PM
-            - Location: AutoXloo Premium Dealership, 123 Main St
-            - Confirmation #: TD-{str(uuid.uuid4())[:5].upper()}
-            """,
+            description=_SCHEDULING_TASK_TEMPLATE.substitute(
+                message=message,
+                confirmation=secrets.token_hex(3).upper()
+            ),
             agent=self.scheduling_agent,
             expected_output="A professional appointment confirmation with all details"
         )
     
     def _create_qualification_task(self, message: str, context: Dict) -> Task:
         """Create task for lead qualification"""
+        from crewai import Task
+
         return Task(
-            description=f"""
-            Customer message: "{message}"
-            Conversation context: {context}
-            
-            As a sales development rep, your job is to:
-            1. Acknowledge their interest
-            2. Ask 1-2 qualifying questions about:
-               - Timeline for purchase
-               - Trade-in vehicle (if any)
-               - Financing needs
-               - Primary use case (family, commute, etc.)
-            
-            Be conversational and helpful, not pushy.
-            """,
+            description=_QUALIFICATION_TASK_TEMPLATE.substitute(
+                message=message,
+                context=context
+            ),
             agent=self.qualifier_agent,
             expected_output="A friendly response with qualified lead questions"
         )
     
+    async def _run_crew(self, agent, task):
+        """Build a single-task crew and kick it off
+
+        Each request gets its own Crew so concurrent chats never share
+        mutable kickoff state; construction cost is negligible next to the
+        LLM round trip. Prefers CrewAI's native kickoff_async when the
+        installed version provides it, falling back to running the sync
+        kickoff in an executor (off the event loop). verbose stays off on
+        the hot path - stdout logging serializes under a lock.
+        """
+        from crewai import Crew, Process
+
+        crew = Crew(
+            agents=[agent], tasks=[task],
+            verbose=False, process=Process.sequential
+        )
+        kickoff_async = getattr(crew, 'kickoff_async', None)
+        if kickoff_async is not None:
+            return await kickoff_async()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, crew.kickoff)
+
+    async def stream_customer_query(self, message: str, conversation_id: Optional[str] = None):
+        """Stream a response token-by-token as the LLM produces it
+
+        The research route sends its task prompt straight to the LLM
+        (bypassing the blocking crew kickoff) so tokens can be forwarded as
+        they arrive. Other routes fall back to the full pipeline and yield
+        the finished response as a single chunk.
+        """
+        if not conversation_id:
+            conversation_id = str(uuid.uuid4())
+
+        message_lower = message.lower()
+        if any(keyword in message_lower for keyword in ['schedule', 'test drive', 'appointment', 'book', 'visit']):
+            result = await self.process_customer_query(message, conversation_id)
+            yield result['response']
+            return
+
+        self.conversations.setdefault(conversation_id, deque(maxlen=50)).append({
+            'role': 'user',
+            'content': message,
+            'timestamp': time.time()
+        })
+
+        task = await self._create_vehicle_search_task(message)
+        async for chunk in self.llm.astream(task.description):
+            if chunk.content:
+                yield chunk.content
+
     async def process_customer_query(
         self, 
         message: str, 
@@ -385,14 +703,12 @@ class AutoXlooCrew:
         if not conversation_id:
             conversation_id = str(uuid.uuid4())
         
-        # Store in conversation history
-        if conversation_id not in self.conversations:
-            self.conversations[conversation_id] = []
-        
-        self.conversations[conversation_id].append({
+        # Store in conversation history (bounded so long sessions don't
+        # grow memory without limit)
+        self.conversations.setdefault(conversation_id, deque(maxlen=50)).append({
             'role': 'user',
             'content': message,
-            'timestamp': str(uuid.uuid4())
+            'timestamp': time.time()
         })
         
         # Track which agents were used
@@ -405,32 +721,76 @@ class AutoXlooCrew:
             # Route 1: Scheduling/Test Drive
             if any(keyword in message_lower for keyword in ['schedule', 'test drive', 'appointment', 'book', 'visit']):
                 agents_used.append('scheduling')
-                task = self._create_scheduling_task(message)
-                crew = Crew(
-                    agents=[self.scheduling_agent],
-                    tasks=[task],
-                    verbose=True,
-                    process=Process.sequential
+                result = await self._run_crew(
+                    self.scheduling_agent,
+                    self._create_scheduling_task(message)
                 )
-                result = crew.kickoff()
                 response = str(result)
-            
+
             # Route 2: Vehicle Search (most common)
             else:
                 agents_used.append('research')
-                task = self._create_vehicle_search_task(message)
-                crew = Crew(
-                    agents=[self.research_agent],
-                    tasks=[task],
-                    verbose=True,
-                    process=Process.sequential
+                criteria = self._extract_search_criteria(message)
+                matching_vehicles = self._search_inventory(criteria)
+                strong_interest = any(
+                    keyword in message_lower
+                    for keyword in ['interested', 'want', 'need', 'looking for', 'buy']
                 )
-                result = crew.kickoff()
-                response = str(result)
-                
-                # Add qualifier if expressing strong interest
-                if any(keyword in message_lower for keyword in ['interested', 'want', 'need', 'looking for', 'buy']):
+                if strong_interest:
                     agents_used.append('qualifier')
+
+                # Identical questions over the same matches repeat the same
+                # answer - serve those from cache instead of paying for a
+                # fresh LLM round-trip. The normalized message hash is part
+                # of the key: criteria are too coarse on their own, and two
+                # different questions about the same vehicles must not share
+                # an answer.
+                cache_key = (
+                    'research',
+                    strong_interest,
+                    hashlib.sha1(' '.join(message_lower.split()).encode()).digest(),
+                    tuple(sorted(
+                        (k, tuple(v) if isinstance(v, list) else v)
+                        for k, v in criteria.items()
+                    )),
+                    tuple(v['stock_number'] for v in matching_vehicles[:3])
+                )
+                cached = self._resp_cache.get(cache_key)
+
+                if cached and time.time() - cached[0] >= self.RESPONSE_CACHE_TTL:
+                    del self._resp_cache[cache_key]
+                    cached = None
+
+                if cached:
+                    response = cached[1]
+                else:
+                    task = await self._create_vehicle_search_task(
+                        message, criteria, matching_vehicles
+                    )
+                    research_future = asyncio.ensure_future(self._run_crew(
+                        self.research_agent, task
+                    ))
+
+                    # Run the qualifier in parallel if expressing strong interest
+                    qualifier_future = None
+                    if strong_interest:
+                        qualifier_future = asyncio.ensure_future(self._run_crew(
+                            self.qualifier_agent,
+                            self._create_qualification_task(
+                                message, {'conversation_id': conversation_id}
+                            )
+                        ))
+
+                    if qualifier_future is not None:
+                        research_result, qualifier_result = await asyncio.gather(
+                            research_future, qualifier_future
+                        )
+                        response = f"{research_result}\n\n{qualifier_result}"
+                    else:
+                        response = str(await research_future)
+
+                    if len(self._resp_cache) < 1024:  # Bound cache size
+                        self._resp_cache[cache_key] = (time.time(), response)
             
             return {
                 'response': response,
@@ -3,32 +3,85 @@ Agent Tools - Real capabilities for CrewAI agents
 """
 from langchain.tools import tool
 from datetime import datetime, timedelta
-import json
+import atexit
+import orjson
 import os
+import secrets
+import threading
+import time
 from typing import Dict, Optional
 import random
 
 
 class AgentTools:
     """Collection of tools for AI agents"""
-    
+
     LEADS_FILE = "../data/crm_leads.json"
     APPOINTMENTS_FILE = "../data/appointments.json"
-    
-    @staticmethod
-    def _load_json(filepath: str):
-        """Load JSON file or return empty list"""
-        if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                return json.load(f)
-        return []
-    
-    @staticmethod
-    def _save_json(filepath: str, data):
-        """Save data to JSON file"""
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+
+    FLUSH_INTERVAL = 1.0  # Seconds between batched disk writes
+
+    # Files are loaded once into memory; saves mark them dirty and a
+    # background thread batches the actual disk writes, so each tool call
+    # is an in-memory append instead of a full re-read + re-write
+    _cache: Dict[str, list] = {}
+    _dirty = set()
+    _lock = threading.Lock()
+    _io_lock = threading.Lock()  # Serializes disk writes across flushers
+    _flusher = None
+
+    @classmethod
+    def _load_json(cls, filepath: str):
+        """Load JSON file once, then serve from the in-memory cache"""
+        with cls._lock:
+            if filepath not in cls._cache:
+                if os.path.exists(filepath):
+                    with open(filepath, 'rb') as f:
+                        cls._cache[filepath] = orjson.loads(f.read())
+                else:
+                    cls._cache[filepath] = []
+            return cls._cache[filepath]
+
+    @classmethod
+    def _save_json(cls, filepath: str, data):
+        """Queue data for a batched background write"""
+        with cls._lock:
+            cls._cache[filepath] = data
+            cls._dirty.add(filepath)
+            if cls._flusher is None:
+                cls._flusher = threading.Thread(target=cls._flush_loop, daemon=True)
+                cls._flusher.start()
+                atexit.register(cls._flush)
+
+    @classmethod
+    def _flush_loop(cls):
+        while True:
+            time.sleep(cls.FLUSH_INTERVAL)
+            cls._flush()
+
+    @classmethod
+    def _flush(cls):
+        """Write all dirty files to disk"""
+        # Serialize inside the cache lock so writers can't mutate the lists
+        # mid-dump; the flusher thread and the atexit hook can both land
+        # here, so the actual disk writes take their own lock too
+        with cls._lock:
+            pending = {
+                filepath: orjson.dumps(cls._cache[filepath], option=orjson.OPT_INDENT_2)
+                for filepath in cls._dirty
+            }
+            cls._dirty.clear()
+
+        with cls._io_lock:
+            for filepath, payload in pending.items():
+                try:
+                    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                    with open(filepath, 'wb') as f:
+                        f.write(payload)
+                except OSError:
+                    # Keep the data queued so the next flush retries it
+                    with cls._lock:
+                        cls._dirty.add(filepath)
 
 
 @tool
@@ -108,8 +161,7 @@ def book_test_drive(customer_name: str = "Valued Customer",
     """
     appointments = AgentTools._load_json(AgentTools.APPOINTMENTS_FILE)
     
-    import uuid
-    confirmation_number = f"TD-{str(uuid.uuid4())[:8].upper()}"
+    confirmation_number = f"TD-{secrets.token_hex(4).upper()}"
     
     appointment = {
         "confirmation_number": confirmation_number,
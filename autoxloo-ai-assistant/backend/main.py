@@ -4,9 +4,10 @@ Main entry point for the API
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-import json
+import orjson
 import os
 from dotenv import load_dotenv
 
@@ -18,7 +19,8 @@ load_dotenv()
 app = FastAPI(
     title="AutoXloo AI Sales Assistant",
     description="Multi-agent AI system for automotive dealership sales",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend
@@ -35,13 +37,16 @@ INVENTORY_PATH = "../data/dealership_inventory.json"
 inventory_data = []
 
 try:
-    with open(INVENTORY_PATH, 'r') as f:
-        inventory_data = json.load(f)
+    with open(INVENTORY_PATH, 'rb') as f:
+        inventory_data = orjson.loads(f.read())
     print(f"✓ Loaded {len(inventory_data)} vehicles from inventory")
 except FileNotFoundError:
     print(f"⚠ Warning: Inventory file not found at {INVENTORY_PATH}")
     print("  Run: python scripts/generate_inventory.py")
 
+# Index by stock number for O(1) vehicle lookups
+_INVENTORY_BY_STOCK = {v['stock_number']: v for v in inventory_data}
+
 
 # Pydantic models
 class ChatMessage(BaseModel):
@@ -84,8 +89,8 @@ async def get_inventory(limit: int = 20):
 @app.get("/api/inventory/{stock_number}")
 async def get_vehicle(stock_number: str):
     """Get specific vehicle by stock number"""
-    vehicle = next((v for v in inventory_data if v['stock_number'] == stock_number), None)
-    
+    vehicle = _INVENTORY_BY_STOCK.get(stock_number)
+
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
     
@@ -117,31 +122,72 @@ async def chat(message: ChatMessage):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/stats")
-async def get_stats():
-    """Get dealership and system statistics"""
+def _build_stats_cache():
+    """Compute dealership statistics once; inventory is static after load"""
+    available = 0
+    featured = 0
+    price_total = 0
+    price_min = None
+    price_max = None
+    categories = {}
+
+    for vehicle in inventory_data:
+        if vehicle.get('available', True):
+            available += 1
+        if vehicle.get('featured', False):
+            featured += 1
+        price = vehicle['price']
+        price_total += price
+        if price_min is None or price < price_min:
+            price_min = price
+        if price_max is None or price > price_max:
+            price_max = price
+        cat = vehicle.get('category', 'other')
+        categories[cat] = categories.get(cat, 0) + 1
+
     return {
         "inventory": {
             "total_vehicles": len(inventory_data),
-            "available": sum(1 for v in inventory_data if v.get('available', True)),
-            "featured": sum(1 for v in inventory_data if v.get('featured', False)),
+            "available": available,
+            "featured": featured,
         },
         "price_range": {
-            "min": min(v['price'] for v in inventory_data) if inventory_data else 0,
-            "max": max(v['price'] for v in inventory_data) if inventory_data else 0,
-            "avg": sum(v['price'] for v in inventory_data) // len(inventory_data) if inventory_data else 0,
+            "min": price_min or 0,
+            "max": price_max or 0,
+            "avg": price_total // len(inventory_data) if inventory_data else 0,
         },
-        "categories": _get_category_breakdown(),
+        "categories": categories,
     }
 
 
-def _get_category_breakdown():
-    """Helper to get vehicle category breakdown"""
-    categories = {}
-    for vehicle in inventory_data:
-        cat = vehicle.get('category', 'other')
-        categories[cat] = categories.get(cat, 0) + 1
-    return categories
+_STATS_CACHE = _build_stats_cache()
+
+
+@app.post("/api/chat/stream")
+async def chat_stream(message: ChatMessage):
+    """
+    Streaming chat endpoint - sends response tokens as Server-Sent Events
+    so the frontend can render text as it is generated
+    """
+    async def event_stream():
+        try:
+            async for delta in crew.stream_customer_query(
+                message.message,
+                conversation_id=message.conversation_id
+            ):
+                yield f"data: {orjson.dumps({'delta': delta}).decode()}\n\n"
+            yield "data: [DONE]\n\n"
+        except Exception as e:
+            print(f"Error streaming chat: {e}")
+            yield f"data: {orjson.dumps({'error': str(e)}).decode()}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.get("/api/stats")
+async def get_stats():
+    """Get dealership and system statistics"""
+    return _STATS_CACHE
 
 
 if __name__ == "__main__":
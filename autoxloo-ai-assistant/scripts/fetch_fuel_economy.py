@@ -3,43 +3,134 @@ Data fetcher for FuelEconomy.gov API
 Fetches EPA fuel economy ratings and emissions data
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import functools
 import json
+from datetime import timedelta
 from typing import List, Dict, Optional
 
+try:
+    # Optional: transparently caches GET responses on disk so reruns
+    # short-circuit instead of re-fetching EPA's essentially static data
+    from requests_cache import CachedSession
+except ImportError:
+    CachedSession = None
+
+try:
+    # Optional: orjson serializes straight to bytes, much faster than json
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decode raw response bytes with orjson when available, skipping the
+# stdlib decoder behind requests.Response.json()
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Vehicle-class dispatch built once at import: model → category, then
+# category → shared MPG profile. Resolving a model is a single dict
+# lookup with a default fallback, and the returned dicts are shared
+# constants instead of per-call literals.
+_CATEGORY_MPG = {
+    'suv': {
+        'city_mpg': 28,
+        'highway_mpg': 34,
+        'combined_mpg': 30,
+        'fuel_type': 'Regular Gasoline'
+    },
+    'sedan': {
+        'city_mpg': 32,
+        'highway_mpg': 42,
+        'combined_mpg': 36,
+        'fuel_type': 'Regular Gasoline'
+    },
+    'truck': {
+        'city_mpg': 20,
+        'highway_mpg': 26,
+        'combined_mpg': 22,
+        'fuel_type': 'Regular Gasoline'
+    },
+    'ev': {
+        'city_mpg': 120,  # MPGe
+        'highway_mpg': 100,
+        'combined_mpg': 110,
+        'fuel_type': 'Electricity',
+        'range_miles': 250
+    },
+    'default': {
+        'city_mpg': 25,
+        'highway_mpg': 32,
+        'combined_mpg': 28,
+        'fuel_type': 'Regular Gasoline'
+    }
+}
+
+_MODEL_CATEGORY = {
+    'suv': 'suv', 'cr-v': 'suv', 'rav4': 'suv', 'forester': 'suv',
+    'explorer': 'suv',
+    'civic': 'sedan', 'corolla': 'sedan', 'camry': 'sedan',
+    'accord': 'sedan', 'altima': 'sedan',
+    'f-150': 'truck', 'silverado': 'truck', 'ram': 'truck',
+    'tundra': 'truck', 'tacoma': 'truck',
+    'tesla': 'ev', 'leaf': 'ev', 'bolt': 'ev', 'electric': 'ev', 'ev': 'ev'
+}
+
 
 class FuelEconomyDataFetcher:
     """Fetch fuel economy data from EPA's FuelEconomy.gov API"""
-    
+
     BASE_URL = "https://www.fueleconomy.gov/ws/rest"
-    
+
     def __init__(self):
-        self.session = requests.Session()
-    
+        # Fuel economy ratings are static per model year, so a week-long
+        # disk cache makes repeated development runs effectively free
+        if CachedSession is not None:
+            self.session = CachedSession(
+                '.cache/fueleconomy', backend='sqlite',
+                expire_after=timedelta(days=7), allowable_methods=['GET'])
+        else:
+            self.session = requests.Session()
+        # Sized connection pool + retries so bulk enrichment runs reuse
+        # keep-alive connections instead of re-handshaking per request
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=3, backoff_factor=0.2,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'User-Agent': 'autoxloo/1.0'
+        })
+
     def get_vehicle_by_id(self, vehicle_id: int) -> Dict:
         """Get vehicle details by ID"""
         url = f"{self.BASE_URL}/vehicle/{vehicle_id}"
-        response = self.session.get(url, headers={'Accept': 'application/json'})
+        response = self.session.get(url)
         response.raise_for_status()
-        return response.json()
-    
+        return _loads(response.content)
+
     def search_vehicles(self, year: int, make: str = None, model: str = None) -> List[Dict]:
         """Search for vehicles by year, make, and/or model"""
         url = f"{self.BASE_URL}/vehicle/menu/year?year={year}"
-        
+
         if make:
             url = f"{self.BASE_URL}/vehicle/menu/make?year={year}"
-        
-        response = self.session.get(url, headers={'Accept': 'application/json'})
+
+        response = self.session.get(url)
         response.raise_for_status()
-        return response.json().get('menuItem', [])
-    
+        return _loads(response.content).get('menuItem', [])
+
     def get_vehicles_for_year(self, year: int) -> List[Dict]:
         """Get all vehicles for a specific year"""
         url = f"{self.BASE_URL}/vehicles?year={year}"
-        response = self.session.get(url, headers={'Accept': 'application/json'})
-        
+        response = self.session.get(url)
+
         if response.status_code == 200:
-            return response.json()
+            return _loads(response.content)
         return []
     
     def enrich_vehicle_with_mpg(self, vehicle_data: Dict) -> Dict:
@@ -58,63 +149,32 @@ class FuelEconomyDataFetcher:
         vehicle_data['fuel_economy'] = fuel_economy
         return vehicle_data
     
-    def _get_realistic_mpg(self, make: str, model: str) -> Dict:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _get_realistic_mpg(make: str, model: str) -> Dict:
         """
         Get realistic MPG estimates based on vehicle type
-        This is a fallback for demo purposes
+        This is a fallback for demo purposes; pure in (make, model) so
+        repeat models across the inventory hit the cache. Matched per
+        token so multi-word names ("F-150 Lightning") still classify by
+        their base model.
         """
         model_lower = model.lower() if model else ""
-        
-        # SUVs and Trucks
-        if any(keyword in model_lower for keyword in ['suv', 'cr-v', 'rav4', 'forester', 'explorer']):
-            return {
-                'city_mpg': 28,
-                'highway_mpg': 34,
-                'combined_mpg': 30,
-                'fuel_type': 'Regular Gasoline'
-            }
-        
-        # Sedans
-        elif any(keyword in model_lower for keyword in ['civic', 'corolla', 'camry', 'accord', 'altima']):
-            return {
-                'city_mpg': 32,
-                'highway_mpg': 42,
-                'combined_mpg': 36,
-                'fuel_type': 'Regular Gasoline'
-            }
-        
-        # Trucks
-        elif any(keyword in model_lower for keyword in ['f-150', 'silverado', 'ram', 'tundra', 'tacoma']):
-            return {
-                'city_mpg': 20,
-                'highway_mpg': 26,
-                'combined_mpg': 22,
-                'fuel_type': 'Regular Gasoline'
-            }
-        
-        # Electric
-        elif any(keyword in model_lower for keyword in ['tesla', 'leaf', 'bolt', 'electric', 'ev']):
-            return {
-                'city_mpg': 120,  # MPGe
-                'highway_mpg': 100,
-                'combined_mpg': 110,
-                'fuel_type': 'Electricity',
-                'range_miles': 250
-            }
-        
-        # Default
-        else:
-            return {
-                'city_mpg': 25,
-                'highway_mpg': 32,
-                'combined_mpg': 28,
-                'fuel_type': 'Regular Gasoline'
-            }
+        category = next(
+            (_MODEL_CATEGORY[token] for token in model_lower.split()
+             if token in _MODEL_CATEGORY),
+            'default'
+        )
+        return _CATEGORY_MPG[category]
     
     def save_to_json(self, data: List[Dict], filename: str = "fuel_economy_data.json"):
         """Save fetched data to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=2)
         print(f"Saved fuel economy data for {len(data)} vehicles to {filename}")
 
 
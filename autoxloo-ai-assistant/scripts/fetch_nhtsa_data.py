@@ -2,33 +2,70 @@
 Data fetcher for NHTSA (National Highway Traffic Safety Administration) API
 Fetches vehicle make/model data that actually exists
 """
-import requests
+import asyncio
+import httpx
 import json
+import logging
+import os
 import time
+from itertools import islice
 from typing import List, Dict
 
+try:
+    # Optional: orjson serializes straight to bytes, much faster than json
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decode raw response bytes with orjson when available; NHTSA model
+# listings run to thousands of rows and orjson builds the dicts in C
+_loads = orjson.loads if orjson is not None else json.loads
+
+log = logging.getLogger(__name__)
+
 class NHTSADataFetcher:
     """Fetch vehicle data from NHTSA API"""
-    
+
     BASE_URL = "https://vpic.nhtsa.dot.gov/api/vehicles"
-    
-    def __init__(self):
-        self.session = requests.Session()
-    
-    def get_models_for_make_year(self, make: str, year: int) -> List[Dict]:
-        """Get all models for a specific make and year"""
+    MAX_CONCURRENCY = 4  # Polite cap on simultaneous API requests
+    CACHE_DIR = ".cache/nhtsa"
+    CACHE_TTL = 7 * 86400  # Model listings are static per (make, year)
+
+    def _cache_path(self, make: str, year: int) -> str:
+        return os.path.join(self.CACHE_DIR, f"{make}_{year}.json".lower())
+
+    async def get_models_for_make_year(self, client: httpx.AsyncClient, make: str, year: int) -> List[Dict]:
+        """Get all models for a specific make and year
+
+        Parsed results are cached on disk for CACHE_TTL seconds so reruns
+        skip the network entirely (the aiohttp pipeline can't use
+        requests-cache, so we cache the decoded rows ourselves).
+        """
+        cache_path = self._cache_path(make, year)
+        try:
+            if time.time() - os.path.getmtime(cache_path) < self.CACHE_TTL:
+                with open(cache_path, 'rb') as f:
+                    return _loads(f.read())
+        except OSError:
+            pass
+
         url = f"{self.BASE_URL}/GetModelsForMakeYear/make/{make}/modelyear/{year}?format=json"
         try:
-            response = self.session.get(url, timeout=10)
+            response = await client.get(url, timeout=10.0)
             response.raise_for_status()
-            return response.json().get('Results', [])
+            results = _loads(response.content).get('Results', [])
         except Exception as e:
-            print(f"Error fetching models for {make}: {e}")
+            log.warning("Error fetching models for %s: %s", make, e)
             return []
-    
-    def fetch_popular_vehicles(self, year: int = 2024) -> List[Dict]:
-        """Fetch real vehicle models from NHTSA"""
-        
+
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump(results, f)
+        return results
+
+    async def fetch_popular_vehicles(self, year: int = 2024) -> List[Dict]:
+        """Fetch real vehicle models from NHTSA, all makes concurrently"""
+
         # Popular makes with models that definitely exist
         makes_and_models = {
             "Honda": ["Civic", "Accord", "CR-V", "Pilot"],
@@ -40,62 +77,74 @@ class NHTSADataFetcher:
             "Mazda": ["CX-5", "CX-9", "Mazda3", "CX-30"],
             "Hyundai": ["Elantra", "Tucson", "Santa Fe", "Sonata"],
         }
-        
+
+        # Fire all make requests concurrently; the semaphore keeps us polite
+        # to the API instead of a blanket sleep between serial calls
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+
+        async def fetch_make(client: httpx.AsyncClient, make: str) -> List[Dict]:
+            async with semaphore:
+                log.debug("Fetching %s models for %s", make, year)
+                return await self.get_models_for_make_year(client, make, year)
+
+        # HTTP/2 multiplexes the whole fan-out over one TCP+TLS stream,
+        # so the handshake cost is paid once
+        limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        async with httpx.AsyncClient(http2=True, limits=limits) as client:
+            results = await asyncio.gather(
+                *[fetch_make(client, make) for make in makes_and_models]
+            )
+
         vehicles = []
-        
-        for make, models in makes_and_models.items():
-            print(f"Fetching {make} models for {year}")
-            
-            # Get what NHTSA actually has for this make/year
-            nhtsa_models = self.get_models_for_make_year(make, year)
-            
+
+        for (make, models), nhtsa_models in zip(makes_and_models.items(), results):
             if nhtsa_models:
-                # Use real NHTSA data
-                for model_data in nhtsa_models[:5]:  # Top 5 from NHTSA
-                    vehicle_info = {
-                        'year': year,
-                        'make': make,
-                        'model': model_data.get('Model_Name'),
-                        'make_id': model_data.get('Make_ID'),
-                        'model_id': model_data.get('Model_ID'),
-                        'source': 'NHTSA_API'
-                    }
-                    vehicles.append(vehicle_info)
-                    print(f"  ✓ {make} {model_data.get('Model_Name')}")
+                # Use real NHTSA data (top 5, without slicing a copy)
+                vehicles.extend({
+                    'year': year,
+                    'make': make,
+                    'model': m.get('Model_Name'),
+                    'make_id': m.get('Make_ID'),
+                    'model_id': m.get('Model_ID'),
+                    'source': 'NHTSA_API'
+                } for m in islice(nhtsa_models, 5))
+                log.debug("%s: %d models from NHTSA", make, min(len(nhtsa_models), 5))
             else:
                 # Fallback to known models if API fails
-                for model in models[:3]:
-                    vehicle_info = {
-                        'year': year,
-                        'make': make,
-                        'model': model,
-                        'source': 'Known_Popular_Models'
-                    }
-                    vehicles.append(vehicle_info)
-                    print(f"  • {make} {model} (using known model)")
-            
-            time.sleep(0.5)  # Be nice to the API
-        
+                vehicles.extend({
+                    'year': year,
+                    'make': make,
+                    'model': model,
+                    'source': 'Known_Popular_Models'
+                } for model in islice(models, 3))
+                log.debug("%s: using known models", make)
+
         return vehicles
-    
+
     def save_to_json(self, data: List[Dict], filename: str = "nhtsa_vehicles.json"):
         """Save fetched data to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=2)
         print(f"\n✓ Saved {len(data)} vehicles to {filename}")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     fetcher = NHTSADataFetcher()
-    
+
     print("=" * 60)
     print("Fetching REAL vehicle data from NHTSA API...")
     print("=" * 60 + "\n")
-    
-    vehicles = fetcher.fetch_popular_vehicles(year=2024)
-    
+
+    vehicles = asyncio.run(fetcher.fetch_popular_vehicles(year=2024))
+
     fetcher.save_to_json(vehicles, "../data/nhtsa_vehicles.json")
-    
+
     print(f"\n{'=' * 60}")
     print(f"SUCCESS: Fetched {len(vehicles)} real vehicles")
     print(f"{'=' * 60}")
@@ -2,13 +2,108 @@
 Generate realistic dealership inventory using real data + synthetic augmentation
 Combines NHTSA specs, fuel economy, and market pricing
 """
+import bisect
+import functools
+import itertools
 import json
 import random
+import re
+import numpy as np
 from datetime import datetime, timedelta
 from faker import Faker
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+try:
+    # Optional: orjson serializes straight to bytes, much faster than json
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # Numba is an optional accelerator
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+try:
+    # Optional: an Aho-Corasick automaton scans all category keywords in
+    # one pass over the model name
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+_loads = orjson.loads if orjson is not None else json.loads
 
 fake = Faker()
+rng = np.random.default_rng()
+
+# Character pools for vectorized VIN assembly
+_VIN_LETTERS = np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', dtype='S1')
+_VIN_DIGITS = np.frombuffer(b'0123456789', dtype='S1')
+
+
+# Category keywords, single source for both categorizer backends: the
+# compiled regex fallback and the optional Aho-Corasick automaton
+_CATEGORY_KEYWORDS = {
+    'suv': ('suv', 'cr-v', 'rav4', 'explorer', 'forester', 'pathfinder'),
+    'truck': ('f-150', 'silverado', 'ram', 'tundra', 'tacoma', 'ranger'),
+    'electric': ('tesla', 'leaf', 'bolt', 'ev', 'electric'),
+    'minivan': ('odyssey', 'sienna', 'pacifica', 'carnival'),
+    'coupe': ('mustang', 'camaro', 'challenger'),
+}
+
+# One compiled alternation replaces five substring-scan chains; the
+# matching named group is the category
+_CATEGORY_RE = re.compile(
+    '|'.join(
+        f"(?P<{category}>{'|'.join(map(re.escape, keywords))})"
+        for category, keywords in _CATEGORY_KEYWORDS.items()
+    ),
+    re.IGNORECASE
+)
+
+if ahocorasick is not None:
+    _CATEGORY_AUTOMATON = ahocorasick.Automaton()
+    for _category, _keywords in _CATEGORY_KEYWORDS.items():
+        for _keyword in _keywords:
+            _CATEGORY_AUTOMATON.add_word(_keyword, _category)
+    _CATEGORY_AUTOMATON.make_automaton()
+else:
+    _CATEGORY_AUTOMATON = None
+
+
+def _generate_vins(count: int) -> List[str]:
+    """Draw all VIN characters for a batch in two rng.integers calls
+
+    Matches the '??########???????' shape fake.bothify produced (2
+    letters, 8 digits, 7 letters) without ~17 Python RNG calls per VIN.
+    """
+    letters = _VIN_LETTERS[rng.integers(0, 26, size=(count, 9))]
+    digits = _VIN_DIGITS[rng.integers(0, 10, size=(count, 8))]
+    chars = np.concatenate((letters[:, :2], digits, letters[:, 2:]), axis=1)
+    return [vin.decode() for vin in chars.view('S17').ravel()]
+
+
+@njit(cache=True)
+def _compute_prices(cat_idx, years, cond_idx, price_min_tbl, price_max_tbl,
+                    cond_factor_tbl, u_rand):
+    """Price every listing in one pass over preallocated arrays
+
+    Pure arithmetic mirroring _generate_price; with Numba installed it
+    compiles to machine code, without it it runs as plain NumPy-indexed
+    Python.
+    """
+    n = cat_idx.shape[0]
+    out = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        year_factor = 1.0 if years[i] >= 2024 else 0.85 if years[i] >= 2023 else 0.70
+        factor = year_factor * cond_factor_tbl[cond_idx[i]]
+        lo = int(price_min_tbl[cat_idx[i]] * factor)
+        hi = int(price_max_tbl[cat_idx[i]] * factor)
+        out[i] = lo + int(u_rand[i] * (hi - lo + 1))
+    return out
 
 
 class InventoryGenerator:
@@ -35,6 +130,16 @@ class InventoryGenerator:
         ('Green', 0.05),
         ('Bronze', 0.05),
     ]
+
+    # Split once at class scope so the per-listing draw doesn't rebuild
+    # name/weight lists from COLORS every call; the precomputed CDF lets
+    # a single draw be one random() + bisect instead of random.choices
+    # re-accumulating the weights each time
+    _COLOR_NAMES = tuple(c[0] for c in COLORS)
+    _COLOR_CDF = tuple(itertools.accumulate(c[1] for c in COLORS))
+    _COLOR_TOTAL = _COLOR_CDF[-1]
+    # Normalized probabilities for batched rng.choice draws
+    _COLOR_PROBS = np.array([c[1] for c in COLORS]) / _COLOR_TOTAL
     
     # Condition and mileage
     CONDITION_MILEAGE = [
@@ -43,8 +148,30 @@ class InventoryGenerator:
         ('Used - Excellent', 15000, 45000),
         ('Used - Good', 30000, 75000),
     ]
+
+    # Parallel arrays so generate_inventory can draw condition indices
+    # and mileages for the whole batch in two vectorized calls
+    _COND_NAMES = tuple(c[0] for c in CONDITION_MILEAGE)
+    _COND_MIN_MI = np.array([c[1] for c in CONDITION_MILEAGE])
+    _COND_MAX_MI = np.array([c[2] for c in CONDITION_MILEAGE])
+
+    # Lookup tables for the compiled price kernel: category code and
+    # condition index select base range and discount factor by position
+    _CATEGORY_ORDER = tuple(PRICE_RANGES)
+    # Iterate .values() directly: a comprehension body inside a class
+    # body can't see class attributes, only its outermost iterable
+    _PRICE_MIN_TBL = np.array([lo for lo, _ in PRICE_RANGES.values()],
+                              dtype=np.int64)
+    _PRICE_MAX_TBL = np.array([hi for _, hi in PRICE_RANGES.values()],
+                              dtype=np.int64)
+    _COND_FACTOR_TBL = np.array([1.0, 0.85, 0.75, 0.60])  # CONDITION_MILEAGE order
+
+    # Scalar-path lookup tables mirroring the kernel's: factor by year
+    # (clamped to 2024 so newer years stay at full price) and condition
+    _YEAR_FACTOR = {2024: 1.0, 2023: 0.85}
+    _CONDITION_FACTOR = dict(zip(_COND_NAMES, (1.0, 0.85, 0.75, 0.60)))
     
-    FEATURES = [
+    FEATURES = (
         'Navigation System',
         'Backup Camera',
         'Blind Spot Monitoring',
@@ -57,47 +184,37 @@ class InventoryGenerator:
         'Wireless Charging',
         '360-Degree Camera',
         'Premium Audio System',
-    ]
+    )
     
     def __init__(self):
         self.stock_number_counter = 10000
-    
-    def _categorize_vehicle(self, model: str) -> str:
-        """Determine vehicle category from model name"""
-        model_lower = model.lower()
-        
-        if any(x in model_lower for x in ['suv', 'cr-v', 'rav4', 'explorer', 'forester', 'pathfinder']):
-            return 'suv'
-        elif any(x in model_lower for x in ['f-150', 'silverado', 'ram', 'tundra', 'tacoma', 'ranger']):
-            return 'truck'
-        elif any(x in model_lower for x in ['tesla', 'leaf', 'bolt', 'ev', 'electric']):
-            return 'electric'
-        elif any(x in model_lower for x in ['odyssey', 'sienna', 'pacifica', 'carnival']):
-            return 'minivan'
-        elif any(x in model_lower for x in ['mustang', 'camaro', 'challenger']):
-            return 'coupe'
-        else:
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _categorize_vehicle(model: str) -> str:
+        """Determine vehicle category from model name
+
+        Static so the cache keys on the model name alone; inventories
+        repeat a few dozen distinct models, so most calls are hits.
+        """
+        if _CATEGORY_AUTOMATON is not None:
+            for _, category in _CATEGORY_AUTOMATON.iter(model.lower()):
+                return category
             return 'sedan'
+        m = _CATEGORY_RE.search(model)
+        return m.lastgroup if m else 'sedan'
     
     def _generate_price(self, category: str, year: int, condition: str) -> int:
         """Generate realistic price based on category, year, and condition"""
         base_min, base_max = self.PRICE_RANGES.get(category, (25000, 45000))
-        
-        # Adjust for year (newer = more expensive)
-        year_factor = 1.0 if year >= 2024 else 0.85 if year >= 2023 else 0.70
-        
-        # Adjust for condition
-        condition_factor = {
-            'New': 1.0,
-            'Certified Pre-Owned': 0.85,
-            'Used - Excellent': 0.75,
-            'Used - Good': 0.60,
-        }.get(condition, 0.75)
-        
-        min_price = int(base_min * year_factor * condition_factor)
-        max_price = int(base_max * year_factor * condition_factor)
-        
-        return random.randint(min_price, max_price)
+
+        # Adjust for year (newer = more expensive) and condition via the
+        # precomputed tables instead of per-call branches and dict literals
+        year_factor = self._YEAR_FACTOR.get(min(year, 2024), 0.70)
+        condition_factor = self._CONDITION_FACTOR.get(condition, 0.75)
+
+        factor = year_factor * condition_factor
+        return random.randint(int(base_min * factor), int(base_max * factor))
     
     def _get_safety_rating(self, make: str, model: str) -> Dict:
         """Generate realistic safety ratings"""
@@ -116,33 +233,46 @@ class InventoryGenerator:
             'rollover': random.randint(3, 5),
         }
     
-    def generate_vehicle_listing(self, base_vehicle: Dict) -> Dict:
+    def generate_vehicle_listing(self, base_vehicle: Dict,
+                                 condition: Optional[str] = None,
+                                 mileage: Optional[int] = None,
+                                 color: Optional[str] = None,
+                                 price: Optional[int] = None,
+                                 vin: Optional[str] = None,
+                                 stock_number: Optional[str] = None) -> Dict:
         """
         Transform base vehicle data into full dealership listing
         Input: {'year': 2024, 'make': 'Honda', 'model': 'CR-V', 'fuel_economy': {...}}
+
+        condition/mileage/color/price/vin/stock_number may be supplied
+        by a batched caller; when omitted, they are drawn per call as
+        before.
         """
         category = self._categorize_vehicle(base_vehicle.get('model', ''))
-        
+
         # Select condition and mileage
-        condition, min_miles, max_miles = random.choice(self.CONDITION_MILEAGE)
-        mileage = random.randint(min_miles, max_miles)
+        if condition is None:
+            condition, min_miles, max_miles = random.choice(self.CONDITION_MILEAGE)
+            mileage = random.randint(min_miles, max_miles)
         
         # Generate price
-        price = self._generate_price(
-            category,
-            base_vehicle.get('year', 2024),
-            condition
-        )
+        if price is None:
+            price = self._generate_price(
+                category,
+                base_vehicle.get('year', 2024),
+                condition
+            )
         
         # Select color
-        color = random.choices(
-            [c[0] for c in self.COLORS],
-            weights=[c[1] for c in self.COLORS]
-        )[0]
+        if color is None:
+            color = self._COLOR_NAMES[
+                bisect.bisect(self._COLOR_CDF, random.random() * self._COLOR_TOTAL)
+            ]
         
         # Generate stock number
-        stock_number = f"AX{self.stock_number_counter}"
-        self.stock_number_counter += 1
+        if stock_number is None:
+            stock_number = f"AX{self.stock_number_counter}"
+            self.stock_number_counter += 1
         
         # Select features
         num_features = random.randint(5, 10)
@@ -155,7 +285,7 @@ class InventoryGenerator:
         listing = {
             # Basic Info
             'stock_number': stock_number,
-            'vin': fake.bothify(text='??########???????').upper(),
+            'vin': vin if vin is not None else fake.bothify(text='??########???????').upper(),
             'year': base_vehicle.get('year'),
             'make': base_vehicle.get('make'),
             'model': base_vehicle.get('model'),
@@ -205,31 +335,97 @@ class InventoryGenerator:
         
         return listing
     
+    def iter_inventory(self, base_vehicles: List[Dict], count: int = 50):
+        """Yield dealership listings one at a time
+
+        Streaming counterpart to generate_inventory for writers like
+        save_to_jsonl that don't need the whole batch in memory; only
+        the flat random-draw arrays are held, not count listing dicts.
+        """
+        # Draw the numeric randomness for the whole batch up front —
+        # base picks, condition indices and mileages each come from one
+        # vectorized call instead of per-listing Python RNG invocations
+        base_idx = rng.integers(0, len(base_vehicles), size=count)
+        cond_idx = rng.integers(0, len(self._COND_NAMES), size=count)
+        mileages = rng.integers(self._COND_MIN_MI[cond_idx],
+                                self._COND_MAX_MI[cond_idx] + 1)
+        colors = rng.choice(self._COLOR_NAMES, size=count, p=self._COLOR_PROBS)
+
+        # Encode per-base category/year once, then price the whole batch
+        # through the compiled kernel
+        cat_codes = np.array([
+            self._CATEGORY_ORDER.index(self._categorize_vehicle(v.get('model', '')))
+            for v in base_vehicles
+        ])
+        base_years = np.array([v.get('year', 2024) for v in base_vehicles],
+                              dtype=np.int64)
+        prices = _compute_prices(cat_codes[base_idx], base_years[base_idx],
+                                 cond_idx, self._PRICE_MIN_TBL,
+                                 self._PRICE_MAX_TBL, self._COND_FACTOR_TBL,
+                                 rng.random(count))
+        vins = _generate_vins(count)
+
+        # Reserve the whole stock-number block up front
+        start = self.stock_number_counter
+        stocks = [f"AX{n}" for n in range(start, start + count)]
+        self.stock_number_counter += count
+
+        # Generate listings based on base vehicles (may repeat with variations)
+        for i in range(count):
+            yield self.generate_vehicle_listing(
+                base_vehicles[base_idx[i]],
+                condition=self._COND_NAMES[cond_idx[i]],
+                mileage=int(mileages[i]),
+                color=str(colors[i]),
+                price=int(prices[i]),
+                vin=vins[i],
+                stock_number=stocks[i],
+            )
+
     def generate_inventory(self, base_vehicles: List[Dict], count: int = 50) -> List[Dict]:
         """Generate full dealership inventory"""
-        inventory = []
-        
-        # Generate listings based on base vehicles (may repeat with variations)
-        while len(inventory) < count:
-            base = random.choice(base_vehicles)
-            listing = self.generate_vehicle_listing(base)
-            inventory.append(listing)
-        
-        return inventory
+        return list(self.iter_inventory(base_vehicles, count))
     
     def save_to_json(self, inventory: List[Dict], filename: str):
         """Save inventory to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump(inventory, f, indent=2)
+        # Serialize to one payload first; json.dump's iterencode issues
+        # many small writes, this flushes everything in a single call
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(inventory, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                f.write(json.dumps(inventory, indent=2))
         print(f"✓ Generated {len(inventory)} listings saved to {filename}")
 
+    def save_to_jsonl(self, inventory_iter, filename: str):
+        """Stream inventory to a JSONL file, one listing per line
+
+        Pairs with iter_inventory so peak memory stays at one listing
+        regardless of count; readers iterate lines and parse each.
+        """
+        written = 0
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                for listing in inventory_iter:
+                    f.write(orjson.dumps(listing))
+                    f.write(b'\n')
+                    written += 1
+        else:
+            with open(filename, 'w') as f:
+                for listing in inventory_iter:
+                    f.write(json.dumps(listing))
+                    f.write('\n')
+                    written += 1
+        print(f"✓ Streamed {written} listings to {filename}")
+
 
 if __name__ == "__main__":
     # Load base vehicles from NHTSA data
     try:
-        with open('../data/nhtsa_vehicles.json', 'r') as f:
-            nhtsa_vehicles = json.load(f)
-        
+        with open('../data/nhtsa_vehicles.json', 'rb') as f:
+            nhtsa_vehicles = _loads(f.read())
+
         print(f"✓ Loaded {len(nhtsa_vehicles)} vehicles from NHTSA API")
         
         # Augment NHTSA data with fuel economy
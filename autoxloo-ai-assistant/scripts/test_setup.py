@@ -4,6 +4,14 @@ Quick test script to verify the AutoXloo AI Sales Assistant is working
 import json
 import os
 
+try:
+    # Optional: orjson parses multi-MB inventories several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
 def test_inventory_data():
     """Test that inventory data was generated correctly"""
     inventory_path = "../data/dealership_inventory.json"
@@ -12,18 +20,19 @@ def test_inventory_data():
         print("❌ Inventory file not found")
         return False
     
-    with open(inventory_path, 'r') as f:
-        inventory = json.load(f)
-    
+    with open(inventory_path, 'rb') as f:
+        inventory = _loads(f.read())
+
     print(f"✅ Loaded {len(inventory)} vehicles")
     
     # Test data quality
     required_fields = ['stock_number', 'make', 'model', 'year', 'price', 'category']
     
     for vehicle in inventory[:5]:  # Check first 5
-        missing = [field for field in required_fields if field not in vehicle]
+        # Stop at the first missing field instead of collecting them all
+        missing = next((field for field in required_fields if field not in vehicle), None)
         if missing:
-            print(f"❌ Vehicle missing fields: {missing}")
+            print(f"❌ Vehicle missing field: {missing}")
             return False
     
     print("✅ All vehicles have required fields")
@@ -59,10 +68,10 @@ def test_backend_structure():
 
 def show_sample_vehicle():
     """Display a sample vehicle for demo"""
-   inventory_path = "../data/dealership_inventory.json"
-    
-    with open(inventory_path, 'r') as f:
-        inventory = json.load(f)
+    inventory_path = "../data/dealership_inventory.json"
+
+    with open(inventory_path, 'rb') as f:
+        inventory = _loads(f.read())
     
     # Find a nice featured vehicle
     featured = [v for v in inventory if v.get('featured', False)]